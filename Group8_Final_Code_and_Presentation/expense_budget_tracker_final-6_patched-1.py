@@ -1,4 +1,23 @@
+import csv
+import os
+import re
+import sqlite3
+import sys
+from array import array
+from bisect import bisect_left, insort
+from collections import defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import repeat
+from math import isfinite
+
+PLOT_SAVE_ONLY = os.environ.get("PLOT_SAVE_ONLY") == "1"
+
 try:
+    import matplotlib
+    if PLOT_SAVE_ONLY:
+        matplotlib.use("Agg")
     import matplotlib.pyplot as plt
     HAS_MPL = True
 except ImportError:
@@ -8,48 +27,170 @@ except ImportError:
 Tries to import matplotlib for plotting.
 If successful → HAS_MPL = True
 If not installed → program continues without crashing.
+With PLOT_SAVE_ONLY=1 in the environment, the non-GUI "Agg" backend is used
+and plots are saved as PNG files instead of opening a window.
+"""
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+"""
+Same idea for pyahocorasick (keyword matching).
+If installed → descriptions are categorized with one Aho-Corasick scan.
+If not installed → categorize_expense() uses the plain keyword loop.
+"""
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+"""
+Same idea for numpy (monthly totals).
+If installed → per-category sums run as vector operations.
+If not installed → the same results are computed with plain Python loops.
+"""
+
+try:
+    import pandas as pd
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
+"""
+Same idea for pandas (CSV loading).
+If installed → expense and budget CSVs are parsed by pandas' C parser in one call.
+If not installed → the manual loaders (csv module) read the file line by line.
+"""
+
+try:
+    from sortedcontainers import SortedDict
+    HAS_SORTEDCONTAINERS = True
+except ImportError:
+    HAS_SORTEDCONTAINERS = False
+
+"""
+Same idea for sortedcontainers (budget months).
+If installed → budgets_by_month keeps its months sorted as they are added.
+If not installed → months are sorted when they are listed or saved.
 """
 
-IDX_DATE = 0
-IDX_DESC = 1
-IDX_AMOUNT = 2
-IDX_CATEGORY = 3
-IDX_MONTH = 4
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
 
 """
-They define the structure of one expense record, which is stored as a list:
+Same idea for pyarrow (Parquet files).
+If installed → expenses can be saved to / loaded from .parquet files (columnar, compressed).
+If not installed → .parquet files are refused with a message; CSV and SQLite still work.
+"""
 
-["2025-11-01", "Coffee at Cafe", 4.50, "Food", "2025-11"]
+try:
+    import readline # noqa: F401 (importing it is enough)
+except ImportError:
+    pass
 
-Index	Constant	Meaning
-0	IDX_DATE	Date
-1	IDX_DESC	Description
-2	IDX_AMOUNT	Amount
-3	IDX_CATEGORY	Category
-4	IDX_MONTH	Month
 """
+readline gives input() line editing and up-arrow history (e.g. for re-entering file names).
+It is not available on every platform (e.g. Windows), so the program works without it.
+"""
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3") # Files with these endings are saved/loaded as SQLite databases.
+
+PARQUET_EXTENSIONS = (".parquet",) # Expense files with these endings are saved/loaded as Parquet (needs pyarrow).
+
+_MONTH_RE = re.compile(r"\d{4}-\d{2}") # "YYYY-MM" at the start of a date, used by extract_month()
+
+CSV_BUFFER_SIZE = 1 << 20 # 1 MiB file buffer for CSV loading and saving
+
+CSV_FIELD_LIMIT = 1 << 30 # Longest field csv.reader accepts (its 128 KiB default is lower than pandas' limit)
+csv.field_size_limit(CSV_FIELD_LIMIT)
+
+CSV_CHUNK_ROWS = 100_000 # Rows pandas parses at a time, so huge CSVs never sit in memory as one DataFrame.
+
+CSV_BATCH_ROWS = 10_000 # Rows the manual CSV loader collects before storing them with add_expenses().
+
+DESC_INTERN_MAX_LEN = 64 # Descriptions up to this length are interned (repeating merchants share one string).
 
 DEFAULT_CATEGORY = "Other" # If no keyword matches an expense description, the category defaults to "Other".
 
+
+@dataclass(slots=True)
+class Category:
+    name: str
+    keywords: list
+    name_ci: str = field(init=False)
+    keywords_ci: frozenset = field(init=False)
+
+    def __post_init__(self):
+        self.name_ci = self.name.lower()
+        self.keywords_ci = frozenset(kw.lower() for kw in self.keywords)
+
+"""
+One categorization rule: a category name and its keywords.
+name_ci / keywords_ci are the lowercase versions, computed once when the rule is created,
+so case-insensitive checks do not call .lower() again every time.
+Rules are never changed in place: editing a rule replaces it with a new Category.
+"""
+
 CATEGORY_RULES = [
-    ("Housing", ["rent", "mortgage", "utility", "utilities"]),
-    ("Transport", ["uber", "taxi", "bus", "train", "metro", "tram"]),
-    ("Food", ["coffee", "cafe", "restaurant", "grocery", "supermarket", "food"]),
-    ("Entertainment", ["cinema", "movie", "concert", "subscription", "netflix", "spotify", "game"]),
+    Category("Housing", ["rent", "mortgage", "utility", "utilities"]),
+    Category("Transport", ["uber", "taxi", "bus", "train", "metro", "tram"]),
+    Category("Food", ["coffee", "cafe", "restaurant", "grocery", "supermarket", "food"]),
+    Category("Entertainment", ["cinema", "movie", "concert", "subscription", "netflix", "spotify", "game"]),
 ]
 
-expenses = [] # Stores all expense records.
-budgets_by_month = {}
+# Expense store (struct-of-arrays): one column per field, row i is the i-th expense.
+_dates = []             # "YYYY-MM-DD" strings (interned: many rows share a date)
+_descs = []             # descriptions (short ones interned, see _intern_desc())
+_amounts = array("d")   # amounts as contiguous float64
+_cat_ids = array("i")   # category id per row (see _cat_names)
+_month_ids = array("i") # month id per row (see _month_names)
+_cat_index = {}         # category name → id
+_cat_names = []         # id → category name
+_month_index = {}       # "YYYY-MM" → id
+_month_names = []       # id → "YYYY-MM"
+_expenses_by_month = {} # "YYYY-MM" → sorted list of row numbers in that month
+
+if HAS_SORTEDCONTAINERS:
+    class _BudgetMonths(SortedDict):
+        def __missing__(self, month):
+            self[month] = budgets = {}
+            return budgets
+
+    budgets_by_month = _BudgetMonths() # "YYYY-MM" → {category: budget}; missing months start as {}
+else:
+    budgets_by_month = defaultdict(dict) # "YYYY-MM" → {category: budget}; missing months start as {}
+_ac_automaton = None # Keyword automaton built from CATEGORY_RULES (None → use the keyword loop).
+_rules_by_name_ci = {} # lowercase category name → position in CATEGORY_RULES
+_keyword_table = () # (keyword, category) pairs in rule order, used without pyahocorasick
+_exact_keyword_category = {} # keyword → category for descriptions that are exactly one keyword
+_cat_ci = {} # category name → casefolded sort key (filled by category_sort_key())
+_fig = None # Figure reused by plot_spending_by_category()
+_expenses_version = 0 # Bumped on every change to the expense store
+_budgets_version = 0 # Bumped on every change to budgets_by_month
+_summary_cache = {} # month → ((expenses_version, budgets_version), month_summary() result)
+_ax = None
 
 def safe_float(text: str):
     s = text.strip().replace(",", ".")
     try:
-        return float(s)
+        value = float(s)
     except ValueError:
         return None
+    return value if isfinite(value) else None
 """
 Converts user input safely into a float.
 Supports European number formats ("12,50" → 12.5).
+"nan" and "inf" are rejected too: float() accepts them, but they are not amounts.
 
 Why return None?
 Prevents program crashes.
@@ -59,47 +200,148 @@ Allows caller to validate input explicitly:
 """
 
 def extract_month(date_str: str): # Extracts "YYYY-MM" from "YYYY-MM-DD". Used for monthly grouping and analysis.
-    s = date_str.strip() # remove whitespace
-    if len(s) < 7: # minimum length check
-        return None
-    if len(s) >= 5 and s[4] != "-": # format check
-        return None
-    year = s[0:4]
-    month = s[5:7]
-    # extract year and month
-    if (not year.isdigit()) or (not month.isdigit()):
-        return None # validate digit
-    return s[0:7] # return "YYYY-MM"
+    m = _MONTH_RE.match(date_str.strip()) # remove whitespace, then check "4 digits - 2 digits" at the start
+    return m.group() if m else None # return "YYYY-MM"
+
 
+def _is_header(line: str, first: str, *others: str):
+    header = line.strip().lower().replace(" ", "")
+    return header.startswith(first + ",") and all(name in header for name in others)
+
+"""
+True if a CSV line looks like a header, e.g. "Date, Description, Amount":
+spaces and case are ignored, it must start with the first column name and
+mention the other column names.
+"""
+
+def _is_blank_row(row):
+    return not row or (len(row) == 1 and not row[0].strip())
+
+"""
+True for csv.reader rows that come from empty or whitespace-only lines,
+which the loaders skip silently. Only checked for rows with fewer than 3 fields.
+"""
+
+def _csv_rows(f, kind: str):
+    try:
+        yield from csv.reader(f)
+    except csv.Error as e:
+        print(f"Error while loading {kind}: {e}")
+
+"""
+Rows of an open CSV file, as csv.reader gives them.
+csv.reader raises csv.Error on broken input, e.g. a field longer than
+CSV_FIELD_LIMIT (an unclosed quote can swallow the rest of a huge file into
+one field). Instead of crashing, the error is printed and reading stops;
+rows read before it are kept by the loaders.
+"""
+
+def rebuild_category_lookups():
+    global _ac_automaton, _keyword_table, _exact_keyword_category
+    _rules_by_name_ci.clear()
+    for i, rule in enumerate(CATEGORY_RULES):
+        _rules_by_name_ci[rule.name_ci] = i
+    _keyword_table = tuple((kw, rule.name) for rule in CATEGORY_RULES for kw in rule.keywords_ci)
+    _categorize_impl.cache_clear()
+    _ac_automaton = None
+    if HAS_AHOCORASICK:
+        automaton = ahocorasick.Automaton()
+        for priority, rule in enumerate(CATEGORY_RULES):
+            for kw in rule.keywords_ci:
+                if kw not in automaton:
+                    automaton.add_word(kw, (priority, rule.name))
+        if len(automaton) > 0:
+            automaton.make_automaton()
+            _ac_automaton = automaton
+    _exact_keyword_category = {kw: _match_keywords(kw) for kw, _ in _keyword_table}
+
+"""
+Rebuilds everything derived from CATEGORY_RULES:
+-_rules_by_name_ci, for O(1) "does this category already exist?" checks.
+-_keyword_table, all keywords flattened into one tuple in rule order.
+-Clears the categorize_expense() result cache (old results may be wrong now).
+-One Aho-Corasick automaton from all keywords (when pyahocorasick is installed).
+ Each keyword stores (priority, category), where priority is the rule position,
+ so a keyword shared by two rules keeps the first (highest-priority) rule.
+-_exact_keyword_category: keyword → the category a description equal to that
+ keyword gets. Stored as the full matcher's answer, not the keyword's own rule,
+ because another rule's keyword can be a substring of it (e.g. "bus" in "business").
+Must be called again every time CATEGORY_RULES changes.
+"""
+
+
+def category_sort_key(name: str):
+    key = _cat_ci.get(name)
+    if key is None:
+        key = _cat_ci[name] = name.casefold()
+    return key
+
+"""
+Sort key for category names (case-insensitive, Unicode-aware via casefold()).
+Each name is casefolded once and remembered in _cat_ci, so repeated sorts in
+summaries, budget lists and plots only do a dict lookup per name.
+The key depends only on the name itself, so it never needs to be invalidated.
+"""
 
 def categorize_expense(description: str):
-    text = (description or "").lower()
-    for category, keywords in CATEGORY_RULES:
-        for kw in keywords:
-            if kw in text:
-                return category
+    return _categorize_impl(description or "")
+
+
+@lru_cache(maxsize=4096)
+def _categorize_impl(description: str):
+    text = description.lower()
+    category = _exact_keyword_category.get(text)
+    if category is not None:
+        return category
+    return _match_keywords(text)
+
+
+def _match_keywords(text: str):
+    if _ac_automaton is not None:
+        best = None
+        for _, hit in _ac_automaton.iter(text):
+            if best is None or hit < best:
+                best = hit
+                if hit[0] == 0:
+                    break
+        return best[1] if best is not None else DEFAULT_CATEGORY
+    for kw, category in _keyword_table:
+        if kw in text:
+            return category
     return DEFAULT_CATEGORY
 
 """
 Takes an expense description (e.g., "Coffee at Cafe").
 Converts it to lowercase safely:
 (description or "") ensures that if description is None, it becomes an empty string instead of crashing.
-Loops through all (category, keywords) rules in CATEGORY_RULES.
-If any keyword is a substring of the description, returns that category.
+Loops through _keyword_table (every keyword of every rule, in rule order).
+If a keyword is a substring of the description, returns its category.
 If no keyword matches, returns DEFAULT_CATEGORY (e.g., "Other").
+With pyahocorasick, all keywords are found in a single pass over the text and
+the match with the lowest priority (earliest rule) wins, same as the loop.
+A match from the first rule cannot be beaten, so the scan stops there.
+
+Descriptions that are exactly one keyword ("uber", "rent") are answered from
+_exact_keyword_category with one dict lookup, before any substring search.
+
+Results are cached per description (lru_cache), because the same descriptions
+repeat a lot (rent, subscriptions, groceries). rebuild_category_lookups()
+clears the cache whenever CATEGORY_RULES changes.
 """
 
+rebuild_category_lookups()
+
 def list_categories():
     if not CATEGORY_RULES:
         print("No categories defined.")
         return
-    print("-" * 60)
-    print(f"{'No.':>3s}  {'Category':20s}  Keywords")
-    print("-" * 60)
-    for i, (category, keywords) in enumerate(CATEGORY_RULES, start=1):
-        keywords_text = ", ".join(keywords)
-        print(f"{i:3d}  {category:20s}  {keywords_text}")
-    print("-" * 60)
+    line = "-" * 60
+    out = [line, f"{'No.':>3s}  {'Category':20s}  Keywords", line]
+    for i, rule in enumerate(CATEGORY_RULES, start=1):
+        keywords_text = ", ".join(rule.keywords)
+        out.append(f"{i:3d}  {rule.name:20s}  {keywords_text}")
+    out.append(line)
+    sys.stdout.write("\n".join(out) + "\n")
 
 """
 Prints a nicely formatted table of categories and their keywords.
@@ -114,25 +356,25 @@ def add_category_interactive():
     if not category:
         print("Invalid category name.")
         return
-    for existing, _ in CATEGORY_RULES:
-        if existing.lower() == category.lower():
-            print("Category already exists.")
-            return
+    if category.lower() in _rules_by_name_ci:
+        print("Category already exists.")
+        return
     keywords_input = input("Keywords (comma separated): ").strip()
     keywords = [kw.strip().lower() for kw in keywords_input.split(",") if kw.strip()]
     if not keywords:
         print("At least one keyword is required.")
         return
-    CATEGORY_RULES.append((category, keywords))
+    CATEGORY_RULES.append(Category(category, keywords))
+    rebuild_category_lookups()
     print(f"Category '{category}' added.")
 
 """
 Asks the user to type a category name.
 Rejects empty input.
-Prevents duplicate categories (case-insensitive).
+Prevents duplicate categories (case-insensitive, via _rules_by_name_ci).
 Asks for comma-separated keywords.
 Splits keywords, trims spaces, converts to lowercase, removes empty pieces.
-Appends (category, keywords) to CATEGORY_RULES.
+Appends Category(category, keywords) to CATEGORY_RULES.
 """
 
 def delete_category_interactive():
@@ -148,12 +390,13 @@ def delete_category_interactive():
     if idx < 0 or idx >= len(CATEGORY_RULES):
         print("Selection out of range.")
         return
-    category, _ = CATEGORY_RULES[idx]
+    category = CATEGORY_RULES[idx].name
     confirm = input(f"Delete category '{category}'? (y/N): ").strip().lower()
     if confirm != "y":
         print("Delete cancelled.")
         return
     CATEGORY_RULES.pop(idx)
+    rebuild_category_lookups()
     print(f"Category '{category}' deleted.")
 
 """
@@ -180,16 +423,15 @@ def edit_category_interactive():
         print("Selection out of range.")
         return
 
-    old_category, old_keywords = CATEGORY_RULES[idx]
+    old_rule = CATEGORY_RULES[idx]
+    old_category, old_keywords = old_rule.name, old_rule.keywords
 
     new_category = input(f"New category name (enter to keep '{old_category}'): ").strip()
     if not new_category:
         new_category = old_category
-    else:
-        for existing, _ in CATEGORY_RULES:
-            if existing.lower() == new_category.lower() and existing.lower() != old_category.lower():
-                print("Category already exists. Edit cancelled.")
-                return
+    elif _rules_by_name_ci.get(new_category.lower(), idx) != idx:
+        print("Category already exists. Edit cancelled.")
+        return
 
     while True:
         print(
@@ -209,7 +451,7 @@ def edit_category_interactive():
         if not new_keywords:
             print("At least one keyword is required. Edit cancelled.")
             return
-        existing_set = {kw.lower() for kw in old_keywords}
+        existing_set = set(old_rule.keywords_ci)
         combined = old_keywords[:]
         for kw in new_keywords:
             if kw not in existing_set:
@@ -222,7 +464,7 @@ def edit_category_interactive():
         if not remove_keywords:
             print("At least one keyword is required. Edit cancelled.")
             return
-        remove_set = {kw.lower() for kw in remove_keywords}
+        remove_set = set(remove_keywords)
         new_keywords = [kw for kw in old_keywords if kw.lower() not in remove_set]
         if not new_keywords:
             print("At least one keyword must remain. Edit cancelled.")
@@ -230,22 +472,11 @@ def edit_category_interactive():
     else:
         new_keywords = old_keywords
 
-    CATEGORY_RULES[idx] = (new_category, new_keywords)
+    CATEGORY_RULES[idx] = Category(new_category, new_keywords)
+    rebuild_category_lookups()
 
     if new_category != old_category:
-        for rec in expenses:
-            if rec[IDX_CATEGORY] == old_category:
-                rec[IDX_CATEGORY] = new_category
-        for month, budgets in budgets_by_month.items():
-            if old_category in budgets:
-                old_value = budgets.pop(old_category)
-                if new_category in budgets:
-                    print(
-                        f"Warning: budget already exists for '{new_category}' in {month}. "
-                        "Keeping existing value."
-                    )
-                else:
-                    budgets[new_category] = old_value
+        _rename_category(old_category, new_category)
 
     print("Category updated.")
 
@@ -253,7 +484,7 @@ def edit_category_interactive():
 -User selects a category rule.
 -They can rename the category and/or change its keyword list.
 -If the category name changes, it also updates:
-    -existing expense records (expenses)
+    -existing expense records (category id column _cat_ids)
     -existing budgets (budgets_by_month)
 
 Step-by-step logic
@@ -261,11 +492,14 @@ A) Choose category to edit
     -Same pattern: list, numeric selection, bounds check.
 
 B) Read old values
-    old_category, old_keywords = CATEGORY_RULES[idx]
+    old_rule = CATEGORY_RULES[idx]
+    old_category, old_keywords = old_rule.name, old_rule.keywords
 
 C) Rename logic
 -User can press Enter to keep the name.
 -If they type a new name, duplicates are blocked (case-insensitive).
+-_rules_by_name_ci gives the position of a rule with the same lowercase name;
+ a match at idx itself is the rule being edited, so changing only the case is allowed.
 
 D) Keyword update logic
 -User can press Enter to keep keywords.
@@ -273,38 +507,366 @@ D) Keyword update logic
 -Rejects empty keyword list.
 
 E) Update the rule
-    CATEGORY_RULES[idx] = (new_category, new_keywords)
+    CATEGORY_RULES[idx] = Category(new_category, new_keywords)
 
 F) If category name changed, update expenses + budgets
- 
     if new_category != old_category:
-        for rec in expenses:
-            if rec[IDX_CATEGORY] == old_category:
-                rec[IDX_CATEGORY] = new_category
+        _rename_category(old_category, new_category)
+-See _rename_category() below.
+"""
+
+def _category_id(category: str):
+    cat_id = _cat_index.get(category)
+    if cat_id is None:
+        category = sys.intern(category)
+        cat_id = len(_cat_names)
+        _cat_index[category] = cat_id
+        _cat_names.append(category)
+    return cat_id
+
+
+def _month_id(month: str):
+    month_id = _month_index.get(month)
+    if month_id is None:
+        month = sys.intern(month)
+        month_id = len(_month_names)
+        _month_index[month] = month_id
+        _month_names.append(month)
+    return month_id
+
+"""
+Return the id of a category / month, creating a new id the first time a name is seen.
+Rows only store these small integers; the names are kept once in _cat_names / _month_names.
+Names are interned, so dict lookups against budgets (whose keys are interned
+by the budget loaders too) usually match by identity without comparing characters.
+"""
+
+def _expenses_changed():
+    global _expenses_version
+    _expenses_version += 1
+
 
--Any expense record that had the old category is renamed to the new category.
+def _budgets_changed():
+    global _budgets_version
+    _budgets_version += 1
 
-Then budgets:
+"""
+Every function that changes expenses or budgets calls one of these.
+The version numbers tell month_summary() whether a cached summary is still valid.
+"""
+
+def _intern_desc(desc: str):
+    return sys.intern(desc) if len(desc) <= DESC_INTERN_MAX_LEN else desc
+
+"""
+Descriptions repeat a lot (same shops, same subscriptions every month), so equal
+descriptions are stored as one shared string. Very long descriptions are usually
+unique free text, so they are kept as they are instead of filling the intern table.
+"""
 
-for month, budgets in budgets_by_month.items():
-    if old_category in budgets:
-        old_value = budgets.pop(old_category)
-        if new_category in budgets:
-            print("Warning ... Keeping existing value.")
+def append_expense(date_str: str, desc: str, amount_val: float, category: str, month_val: str):
+    _dates.append(sys.intern(date_str))
+    _descs.append(_intern_desc(desc))
+    _amounts.append(amount_val)
+    _cat_ids.append(_category_id(category))
+    _month_ids.append(_month_id(month_val))
+    _index_add(len(_amounts) - 1, month_val)
+    _expenses_changed()
+
+
+def extend_expenses(dates, descs, amounts, categories, months):
+    cat_ids = {cat: _category_id(cat) for cat in set(categories)}
+    month_ids = {month: _month_id(month) for month in set(months)}
+    first_row = len(_amounts)
+    _dates.extend(map(sys.intern, dates))
+    _descs.extend(map(_intern_desc, descs))
+    _amounts.extend(amounts)
+    _cat_ids.extend([cat_ids[cat] for cat in categories])
+    _month_ids.extend([month_ids[month] for month in months])
+    add_row = {month: _expenses_by_month.setdefault(month, []).append for month in month_ids}
+    for row, month in enumerate(months, start=first_row):
+        add_row[month](row)
+    _expenses_changed()
+
+"""
+Bulk version of append_expense() used by the loaders.
+Ids and month index lists are looked up once per distinct category/month instead of once per row.
+"""
+
+def add_expenses(rows):
+    dates, descs, amounts, categories, months = [], [], [], [], []
+    month_cache = {} # date string → extract_month() result (dates repeat a lot)
+    for date_str, desc, amount_val in rows:
+        if date_str in month_cache:
+            month_val = month_cache[date_str]
         else:
-            budgets[new_category] = old_value
+            month_val = month_cache[date_str] = extract_month(date_str)
+        if month_val is None:
+            continue
+        dates.append(date_str)
+        descs.append(desc)
+        amounts.append(amount_val)
+        categories.append(categorize_expense(desc))
+        months.append(month_val)
+    if dates:
+        extend_expenses(dates, descs, amounts, categories, months)
+    return len(dates)
+
+"""
+Adds many (date, description, amount) expenses at once and returns how many were added.
+-Month is extracted once per distinct date; rows with an invalid date are left out.
+-Category comes from categorize_expense() (cached per description).
+-Everything is then stored with a single extend_expenses() call, so the month
+ index and version number are updated once for the whole batch.
+"""
+
+def expense_count():
+    return len(_amounts)
+
+
+def clear_expenses():
+    _dates.clear()
+    _descs.clear()
+    del _amounts[:]
+    del _cat_ids[:]
+    del _month_ids[:]
+    _cat_index.clear()
+    _cat_names.clear()
+    _month_index.clear()
+    _month_names.clear()
+    _expenses_by_month.clear()
+    _expenses_changed()
+
+
+def _truncate_expenses(row_count: int):
+    if row_count >= expense_count():
+        return
+    del _dates[row_count:]
+    del _descs[row_count:]
+    del _amounts[row_count:]
+    del _cat_ids[row_count:]
+    del _month_ids[row_count:]
+    for month, rows in list(_expenses_by_month.items()):
+        del rows[bisect_left(rows, row_count):]
+        if not rows:
+            del _expenses_by_month[month]
+    _expenses_changed()
 
+"""
+Removes every expense from row number row_count on (used to undo a load that failed halfway).
+Month index lists are sorted, so the removed rows are always at their end.
+Category/month ids stay in their tables; an unused id is harmless.
+"""
+
+def _index_add(row: int, month: str):
+    insort(_expenses_by_month.setdefault(month, []), row)
 
--It moves the old budget value under the new category name (per month).
+
+def _index_remove(row: int, month: str):
+    rows = _expenses_by_month[month]
+    del rows[bisect_left(rows, row)]
+    if not rows:
+        del _expenses_by_month[month]
+
+"""
+Keep _expenses_by_month in sync when a row is added or moved to another month.
+Row lists stay sorted, so a month is always listed in the order expenses were added.
+"""
+
+def rows_for_month(month: str):
+    return _expenses_by_month.get(month, [])
+
+"""
+Returns the row numbers of all expenses in a month (one dict lookup, no scan).
+"""
+
+def _rename_category(old_category: str, new_category: str):
+    old_id = _cat_index.pop(old_category, None)
+    if old_id is not None:
+        new_id = _cat_index.get(new_category)
+        if new_id is None:
+            _cat_index[new_category] = old_id
+            _cat_names[old_id] = new_category
+        elif HAS_NUMPY:
+            cat_ids = np.frombuffer(_cat_ids, dtype=np.intc)
+            cat_ids[cat_ids == old_id] = new_id
+        else:
+            i = -1
+            try:
+                while True:
+                    i = _cat_ids.index(old_id, i + 1)
+                    _cat_ids[i] = new_id
+            except ValueError:
+                pass
+
+    for month, budgets in budgets_by_month.items():
+        if old_category in budgets:
+            old_value = budgets.pop(old_category)
+            if new_category in budgets:
+                print(
+                    f"Warning: budget already exists for '{new_category}' in {month}. "
+                    "Keeping existing value."
+                )
+            else:
+                budgets[new_category] = old_value
+    _expenses_changed()
+    _budgets_changed()
+
+"""
+Renames a category in the expense store and in all budgets.
+
+Expenses:
+-Rows only store a category id, so normally only the id → name tables change
+ (_cat_index / _cat_names) and no expense row is touched.
+-If new_category is already used by other expenses, the two ids are merged:
+ every row with the old id gets the new id (one mask assignment with numpy).
+ Without numpy, array.index() finds the next matching row in C, so only the
+ rows that actually change are visited in Python.
+ The old id is then unused and disappears from totals.
+
+Budgets:
+-Moves the old budget value under the new category name (per month).
 -If the new category already had a budget, it keeps the existing budget and warns.
 """
 
-def load_expenses_csv(filename: str):
+def _read_csv_chunks(filename: str, columns):
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            first_line = f.readline()
+    except FileNotFoundError:
+        print(f"File not found: {filename}")
+        return None
+
+    if not first_line:
+        print("File is empty.")
+        return None
+
+    try:
+        return pd.read_csv(
+            filename,
+            header=0 if _is_header(first_line, *columns) else None,
+            names=columns,
+            usecols=[0, 1, 2],
+            dtype={name: str for name in columns[:-1]},
+            keep_default_na=False,
+            encoding="utf-8",
+            chunksize=CSV_CHUNK_ROWS,
+        )
+    except pd.errors.EmptyDataError:
+        return nullcontext([pd.DataFrame({name: [] for name in columns}, dtype=str)])
+
+
+def _parse_amounts(column):
+    if column.dtype.kind in "iuf":
+        values = column.astype(np.float64)
+    else:
+        if column.dtype.kind != "O":
+            column = column.astype(str)
+        values = pd.to_numeric(column, errors="coerce")
+        retry = values.isna()
+        if retry.any():
+            values[retry] = pd.to_numeric(
+                column[retry].str.strip().str.replace(",", ".", regex=False), errors="coerce"
+            )
+        values = values.astype(np.float64)
+    return values.where(np.isfinite(values))
+
+
+def _map_cached(func, values, cache):
+    return [cache[v] if v in cache else cache.setdefault(v, func(v)) for v in values]
+
+"""
+Shared by the pandas CSV loaders:
+-_read_csv_chunks() reads the first 3 columns of a CSV as DataFrames named by columns,
+ CSV_CHUNK_ROWS rows at a time (only one chunk is in memory at once).
+ The header is detected from the first line before parsing (same _is_header()
+ check as the manual parsers). The text columns are read as str; the last
+ column is left to pandas, so a clean amount column is parsed as float64 in C.
+ Prints the same messages as the manual loaders and returns None if the file
+ is missing or empty. Otherwise returns the chunk reader, to be used in a with
+ block so the file is closed even if parsing fails.
+ pandas raises ParserError for files it cannot split into 3 columns (fewer
+ columns, another separator, an unclosed quote). That error can come from
+ read_csv() or later while reading a chunk, so the loaders catch it around both
+ and hand the file to the manual loader, which reports such rows as skipped.
+-_parse_amounts() returns the amount column as float64. Integer and float columns
+ are used as parsed. Anything else (text, or a column pandas read as True/False)
+ is converted from its text with to_numeric(); only the values that fail are
+ retried with "12,50" → "12.50". Invalid and non-finite values ("True", "nan",
+ "inf") become NaN, so the row is skipped like in the manual parsers.
+-_map_cached() applies func to each value, remembering results in cache, so values
+ repeated across chunks are only processed once per load.
+"""
+
+def load_expenses_csv_pandas(filename: str):
+    first_row = expense_count()
     loaded = 0
     skipped = 0
+    month_cache = {}    # date text → extract_month() result
+    category_cache = {} # description → category
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            lines = f.readlines()
+        chunks = _read_csv_chunks(filename, ["date", "description", "amount"])
+        if chunks is None:
+            return
+        with chunks as reader:
+            for df in reader:
+                chunk_loaded = _add_expense_chunk(df, month_cache, category_cache)
+                loaded += chunk_loaded
+                skipped += len(df) - chunk_loaded
+    except pd.errors.ParserError:
+        _truncate_expenses(first_row)
+        load_expenses_csv_manual(filename)
+        return
+    print(f"Loaded {loaded} expense(s). Skipped {skipped} invalid row(s).")
+
+
+def _add_expense_chunk(df, month_cache, category_cache):
+    amounts = _parse_amounts(df["amount"])
+
+    date_codes, date_uniques = pd.factorize(df["date"])
+    month_uniques = np.array(_map_cached(extract_month, date_uniques, month_cache), dtype=object)
+    month_ok = np.array([month is not None for month in month_uniques], dtype=bool)
+    valid = amounts.notna().to_numpy() & month_ok[date_codes]
+
+    date_codes = date_codes[valid]
+    desc_codes, desc_uniques = pd.factorize(df["description"][valid])
+    desc_uniques = [d.strip() for d in desc_uniques]
+    categories = _map_cached(_categorize_impl.__wrapped__, desc_uniques, category_cache)
+    extend_expenses(
+        np.array([d.strip() for d in date_uniques], dtype=object)[date_codes].tolist(),
+        np.array(desc_uniques, dtype=object)[desc_codes].tolist(),
+        amounts[valid].tolist(),
+        np.array(categories, dtype=object)[desc_codes].tolist(),
+        month_uniques[date_codes].tolist(),
+    )
+    return int(valid.sum())
+
+"""
+Same result as load_expenses_csv_manual(), but the file is parsed by pandas:
+-_read_csv_chunks() reads the file in chunks; blank lines are dropped by pandas.
+ Each chunk is validated and added on its own by _add_expense_chunk() (which returns
+ how many of its rows were valid), so memory stays bounded by the chunk size.
+-If pandas cannot parse the file (ParserError), the rows it already added are removed
+ again (_truncate_expenses()) and the file is loaded by load_expenses_csv_manual()
+ instead, so the result and messages are the same as without pandas.
+-Quoted fields are handled like csv.reader does in the manual parser.
+-Missing fields become "" (keep_default_na=False), so short rows fail the amount check.
+-Dates and descriptions repeat a lot, so pd.factorize() turns each column into
+ codes + distinct values. extract_month(), strip() and categorize_expense() then
+ run once per distinct value and are mapped back onto the rows by code.
+ Months and categories are remembered for the whole load (month_cache,
+ category_cache), so values repeated in later chunks are not recomputed.
+ Categorization bypasses the lru_cache here (__wrapped__): the load keeps its
+ own cache, so filling the lru_cache too would only push out useful entries.
+-A valid row needs a numeric amount and a date extract_month() accepts
+ (same check as the manual parser).
+"""
+
+def load_expenses_csv_manual(filename: str):
+    loaded = 0
+    skipped = 0
+    try:
+        f = open(filename, "r", encoding="utf-8", newline="", buffering=CSV_BUFFER_SIZE)
     except FileNotFoundError:
         print(f"File not found: {filename}")
         return
@@ -313,117 +875,131 @@ def load_expenses_csv(filename: str):
     Initializes counters:
         -loaded: how many valid expense rows were imported
         -skipped: how many rows were invalid and ignored
-    Tries to open the file and read all lines into a list.
+    Tries to open the file (with a 1 MiB buffer); the rows are then read one at a
+    time by csv.reader while parsing, so the whole file is never held in memory.
     If the file does not exist, catches FileNotFoundError and exits cleanly without crashing.
     """
 
-    if not lines:
-        print("File is empty.")
-        return
-
-    """
-    If the file contains zero lines, it prints a message and exits.
-    Prevents later code from trying to read lines[0] (which would crash).
-    """
-
-    start_idx = 0
-    header = lines[0].strip().lower().replace(" ", "")
-    if header.startswith("date,") and "description" in header and "amount" in header:
-        start_idx = 1
-
-    """
-    -Takes the first line, normalizes it:
-        -removes leading/trailing whitespace (strip())
-        -makes it case-insensitive (lower())
-        -removes spaces (replace(" ", ""))
-    -Checks if it looks like a header row (contains date/description/amount).
-    -If yes, sets start_idx = 1 so the loop skips the header.
-    """
-
-    for line in lines[start_idx:]:
-        raw = line.strip()
-        if not raw:
-            continue
+    with f:
+        first_line = f.readline()
+        if not first_line:
+            print("File is empty.")
+            return
 
         """
-        -Iterates over all rows after the header (if any).
-        -Strips whitespace.
-        -Skips empty lines silently.
+        If the file contains zero lines, it prints a message and exits.
         """
-        
-        parts = [p.strip() for p in raw.split(",")]
-        if len(parts) < 3:
-            skipped += 1
-            continue
+
+        if not _is_header(first_line, "date", "description", "amount"):
+            f.seek(0)
 
         """
-        -Splits the row by commas into fields.
-        -If there aren’t at least 3 fields → invalid row → count as skipped.
+        -Takes the first line, _is_header() normalizes it:
+            -removes leading/trailing whitespace (strip())
+            -makes it case-insensitive (lower())
+            -removes spaces (replace(" ", ""))
+        -Checks if it looks like a header row (contains date/description/amount).
+        -If not, rewinds the file so the first line is parsed as data too.
         """
 
-        date_str = parts[0]
-        desc = parts[1]
-        amount_val = safe_float(parts[2])
+        rows = [] # (date, description, amount) of rows with a valid amount, up to CSV_BATCH_ROWS at a time
+
+        for row in _csv_rows(f, "expenses"):
+            if len(row) < 3:
+                if not _is_blank_row(row):
+                    skipped += 1
+                continue
+
+            """
+            -Iterates over all rows after the header (if any).
+            -csv.reader handles quoted fields, so "Dinner, friends" stays one description.
+            -Rows with fewer than 3 fields are rejected before any other work:
+             empty lines are skipped silently, anything else counts as skipped.
+            """
+
+            date_str, desc, amount_txt = row[0].strip(), row[1].strip(), row[2].strip()
+            try:
+                amount_val = float(amount_txt)
+            except ValueError:
+                amount_val = safe_float(amount_txt)
+            if amount_val is None or not isfinite(amount_val):
+                skipped += 1
+                continue
+            rows.append((date_str, desc, amount_val))
+            if len(rows) >= CSV_BATCH_ROWS:
+                added = add_expenses(rows)
+                loaded += added
+                skipped += len(rows) - added
+                rows.clear()
+
+            """
+            -Takes:
+                -date string
+                -description string
+                -amount string → tries float() first (most amounts use "."),
+                 then safe_float() for values like "12,50" or invalid text
+            -If the amount is invalid or not finite ("nan", "inf") → skip the row.
+            -Otherwise the row is collected; every CSV_BATCH_ROWS rows the batch is
+             handed to add_expenses(), so only one batch is held in memory at a time.
+            """
+
+    added = add_expenses(rows)
+    loaded += added
+    skipped += len(rows) - added
 
-        month_val = extract_month(date_str)
-        if amount_val is None or month_val is None:
-            skipped += 1
-            continue
+    """
+    -Adds the last (partial) batch.
+    -add_expenses() extracts the month, drops rows with an invalid date,
+     assigns categories and stores each batch in one go.
+    -Rows it leaves out count as skipped too.
+    """
 
-        """
-        -Takes:
-            -date string
-            -description string
-            -amount string → converts safely using safe_float()
-        -Extracts month (YYYY-MM) from the date using extract_month().
-        -If either amount or month is invalid → skip the row.
-        """
+    print(f"Loaded {loaded} expense(s). Skipped {skipped} invalid row(s).") # Prints summary counts so the user understands what happened.
 
-        category = categorize_expense(desc)
-        record = [date_str, desc, amount_val, category, month_val]
-        expenses.append(record)
-        loaded += 1
 
-        """
-        -Assigns a category based on keywords in the description.
-        -Builds a record list in the program’s internal format:
-            -[date, desc, amount, category, month]
-        -Appends it to the global expenses list.
-        """
+def load_expenses_csv(filename: str):
+    if HAS_PANDAS:
+        load_expenses_csv_pandas(filename)
+    else:
+        load_expenses_csv_manual(filename)
 
-    print(f"Loaded {loaded} expense(s). Skipped {skipped} invalid row(s).") # Prints summary counts so the user understands what happened.
+"""
+Loads expenses from a CSV file: with pandas if it is installed, otherwise with the csv module.
+"""
 
 
 def save_expenses_csv(filename: str):
-    if not expenses:
+    if not expense_count():
         print("No expenses to save.")
         return
 # If there’s nothing in memory, it exits early.
     try:
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write("date,description,amount,category\n")
-            for rec in expenses:
-                date_str = rec[IDX_DATE]
-                desc = rec[IDX_DESC].replace("\n", " ").replace("\r", " ")
-                amount_val = rec[IDX_AMOUNT]
-                cat = rec[IDX_CATEGORY]
-                f.write(f"{date_str},{desc},{amount_val},{cat}\n")
-        print(f"Saved {len(expenses)} expense(s) to '{filename}'.")
+        with open(filename, "w", encoding="utf-8", newline="", buffering=CSV_BUFFER_SIZE) as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(("date", "description", "amount", "category"))
+            descs = map(str.replace, _descs, repeat("\n"), repeat(" "))
+            descs = map(str.replace, descs, repeat("\r"), repeat(" "))
+            writer.writerows(zip(_dates, descs, _amounts, map(_cat_names.__getitem__, _cat_ids)))
+        print(f"Saved {expense_count()} expense(s) to '{filename}'.")
     except Exception as e:
         print(f"Error while saving expenses: {e}")
 
 """
 -Opens a file in write mode "w" (overwrites if it exists).
 -Writes a header row.
--Loops through expenses and writes each record as CSV.
+-Writes all expense rows in one writerows() call, zipping the store columns
+ (map/zip run in C, no Python code per row).
+-The file has a 1 MiB buffer, so rows reach the disk in large blocks instead of many small writes.
+-csv.writer quotes fields that contain commas or quotes, so they stay one field.
 
 Why it replaces \n and \r?
 -If a description contains newline characters, it would break the CSV row structure.
--This sanitizes the text into a single line.
+-This sanitizes the text into a single line. str.replace() scans in C and
+ returns the text unchanged when there is nothing to replace, which is most rows.
 """
 
 def delete_all_expenses():
-    if not expenses:
+    if not expense_count():
         print("No expenses to delete.")
         return
 # If the list is already empty, it exists.
@@ -438,81 +1014,140 @@ def delete_all_expenses():
     -Only "y" proceeds.
     -Anything else cancels safely.
     """
-    expenses.clear()
+    clear_expenses()
     print("All expenses deleted.")
 
     """
-    -Clears the list in-place.
-    -Keeps the list object but removes all elements.
+    -Clears all store columns in-place.
     """
 
-def load_budgets_csv(filename: str):
+def load_budgets_csv_pandas(filename: str):
     loaded = 0
     skipped = 0
+    pending = [] # (month, category, budget) of valid rows, in file order
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            lines = f.readlines()
+        chunks = _read_csv_chunks(filename, ["month", "category", "budget"])
+        if chunks is None:
+            return
+        with chunks as reader:
+            for df in reader:
+                chunk_loaded = _parse_budget_chunk(df, pending)
+                loaded += chunk_loaded
+                skipped += len(df) - chunk_loaded
+    except pd.errors.ParserError:
+        load_budgets_csv_manual(filename)
+        return
+    for month, cat, value in pending:
+        budgets_by_month[month][cat] = value
+    _budgets_changed()
+
+    print(f"Loaded {loaded} budget row(s). Skipped {skipped} invalid row(s).")
+
+
+def _parse_budget_chunk(df, pending):
+    values = _parse_amounts(df["budget"])
+    categories = df["category"].str.strip()
+    month_codes, month_raw = pd.factorize(df["month"])
+    month_uniques = [extract_month(m) for m in month_raw]
+    month_ok = np.array([month is not None for month in month_uniques], dtype=bool)
+    valid = values.notna().to_numpy() & (categories != "").to_numpy() & month_ok[month_codes]
+
+    month_names = [None if month is None else sys.intern(month) for month in month_uniques]
+    pending.extend(
+        (month_names[code], sys.intern(cat), round(value, 2))
+        for code, cat, value in zip(month_codes[valid].tolist(), categories[valid].tolist(), values[valid].tolist())
+    )
+    return int(valid.sum())
+
+"""
+Same result as load_budgets_csv_manual(), but the file is parsed by pandas in chunks (see _read_csv_chunks()).
+-Rows are validated with whole-column masks: a numeric budget, a non-empty
+ category and a month extract_month() accepts (checked once per distinct month text).
+-Each chunk is handled by _parse_budget_chunk(), which collects its valid rows in
+ pending and returns how many there were.
+-Once the whole file is parsed, pending is written in file order, so a later row for
+ the same month/category replaces an earlier one, like in the manual parser.
+-If pandas cannot parse the file (ParserError), nothing has been written yet and the
+ file is loaded by load_budgets_csv_manual() instead, with the same result and messages.
+"""
+
+def load_budgets_csv_manual(filename: str):
+    loaded = 0
+    skipped = 0
+    try:
+        f = open(filename, "r", encoding="utf-8", newline="", buffering=CSV_BUFFER_SIZE)
     except FileNotFoundError:
         print(f"File not found: {filename}")
         return
 
     """
     -Uses try/except to avoid crashing if the file doesn’t exist.
-    -Reads all lines into memory.
+    -Streams the lines while parsing instead of reading them all into memory.
     -Tracks:
         -loaded: valid rows inserted
         -skipped: invalid rows ignored
     """
 
-    if not lines:
-        print("File is empty.")
-        return
-# Prevents accessing lines[0] (would crash).
+    with f:
+        first_line = f.readline()
+        if not first_line:
+            print("File is empty.")
+            return
 
-    start_idx = 0
-    header = lines[0].strip().lower().replace(" ", "")
-    if header.startswith("month,") and "category" in header and "budget" in header:
-        start_idx = 1
+        if not _is_header(first_line, "month", "category", "budget"):
+            f.seek(0)
 
-    """
-    Detects a header line like month,category,budget.
-    If header is present, skips it.
-    """
+        """
+        Detects a header line like month,category,budget.
+        If there is no header, rewinds so the first line is read as data.
+        """
 
-    for line in lines[start_idx:]:
-        raw = line.strip()
-        if not raw:
-            continue
+        month_cache = {} # month text → extract_month() result
 
-        parts = [p.strip() for p in raw.split(",")]
-        if len(parts) < 3:
-            skipped += 1
-            continue
-# Splits by comma, expects at least 3 columns: month, category, budget.
+        for row in _csv_rows(f, "budgets"):
+            if len(row) < 3:
+                if not _is_blank_row(row):
+                    skipped += 1
+                continue
+    # csv.reader splits the row (respecting quotes), expects at least 3 columns: month, category, budget.
 
-        month_raw = parts[0]
-        cat = parts[1]
-        value = safe_float(parts[2])
+            month_raw, cat, value_txt = row[0].strip(), row[1].strip(), row[2].strip()
+            try:
+                value = float(value_txt)
+            except ValueError:
+                value = safe_float(value_txt)
 
-        month_str = extract_month(month_raw)
-        if month_str is None or not cat or value is None:
-            skipped += 1
-            continue
+            if month_raw in month_cache:
+                month_str = month_cache[month_raw]
+            else:
+                month_str = month_cache[month_raw] = extract_month(month_raw)
+            if month_str is None or not cat or value is None or not isfinite(value):
+                skipped += 1
+                continue
 
-        """
-        -Converts amount with safe_float() (handles comma decimals).
-        -Extracts YYYY-MM via extract_month().
-        -Rejects invalid month/category/value.
-        """
+            """
+            -Converts amount with float(), falling back to safe_float() (handles comma decimals).
+            -Extracts YYYY-MM via extract_month(), once per distinct month text.
+            -Rejects invalid month/category/value (including "nan"/"inf" values).
+            """
 
-        if month_str not in budgets_by_month:
-            budgets_by_month[month_str] = {}
-        budgets_by_month[month_str][cat] = round(value, 2)
-        loaded += 1
+            budgets_by_month[sys.intern(month_str)][sys.intern(cat)] = round(value, 2)
+            loaded += 1
 
+    _budgets_changed()
     print(f"Loaded {loaded} budget row(s). Skipped {skipped} invalid row(s).")
 
 
+def load_budgets_csv(filename: str):
+    if HAS_PANDAS:
+        load_budgets_csv_pandas(filename)
+    else:
+        load_budgets_csv_manual(filename)
+
+"""
+Loads budgets from a CSV file: with pandas if it is installed, otherwise with the csv module.
+"""
+
 def save_budgets_csv(filename: str):
     if not budgets_by_month:
         print("No budgets to save.")
@@ -520,11 +1155,14 @@ def save_budgets_csv(filename: str):
 # Avoid creting an empty file
     
     try:
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write("month,category,budget\n")
-            for month in sorted(budgets_by_month.keys()):
-                for cat, value in budgets_by_month[month].items():
-                    f.write(f"{month},{cat},{value}\n")
+        with open(filename, "w", encoding="utf-8", newline="", buffering=CSV_BUFFER_SIZE) as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(("month", "category", "budget"))
+            writer.writerows(
+                (month, cat, value)
+                for month in budget_months()
+                for cat, value in budgets_by_month[month].items()
+            )
         """
         -Writes a header.
         -Sorts months to produce stable output order.
@@ -535,24 +1173,248 @@ def save_budgets_csv(filename: str):
         print(f"Error while saving budgets: {e}")
 
 
+def budget_months():
+    if HAS_SORTEDCONTAINERS:
+        return budgets_by_month.keys()
+    return sorted(budgets_by_month.keys())
+
+"""
+Months that have budgets, in sorted order.
+With sortedcontainers the dict is already sorted, so no sort is needed here.
+"""
+
+def is_sqlite_file(filename: str):
+    return filename.lower().endswith(SQLITE_EXTENSIONS)
+
+
+def save_expenses_sqlite(filename: str):
+    if not expense_count():
+        print("No expenses to save.")
+        return
+    try:
+        con = sqlite3.connect(filename)
+        try:
+            with con:
+                con.execute("DROP TABLE IF EXISTS expenses")
+                con.execute(
+                    "CREATE TABLE expenses "
+                    "(date TEXT, description TEXT, amount REAL, category TEXT, month TEXT)"
+                )
+                con.executemany(
+                    "INSERT INTO expenses VALUES (?, ?, ?, ?, ?)",
+                    zip(
+                        _dates,
+                        _descs,
+                        _amounts,
+                        (_cat_names[cat_id] for cat_id in _cat_ids),
+                        (_month_names[month_id] for month_id in _month_ids),
+                    ),
+                )
+                con.execute("CREATE INDEX expenses_month ON expenses (month)")
+        finally:
+            con.close()
+        print(f"Saved {expense_count()} expense(s) to '{filename}'.")
+    except Exception as e:
+        print(f"Error while saving expenses: {e}")
+
+"""
+-Writes all expenses into the "expenses" table of a SQLite file (replacing the old table).
+-Other tables in the same file (e.g. budgets) are kept.
+-Category and month are stored too, so renamed categories survive a reload.
+-The index on month lets other tools query one month without a full scan.
+-"with con:" commits on success and rolls back on error.
+"""
+
+def load_expenses_sqlite(filename: str):
+    if not os.path.exists(filename):
+        print(f"File not found: {filename}")
+        return
+    try:
+        con = sqlite3.connect(filename)
+        try:
+            rows = con.execute(
+                "SELECT date, description, amount, category, month FROM expenses "
+                "WHERE typeof(date) = 'text' AND typeof(description) = 'text' "
+                "AND typeof(category) = 'text' AND typeof(month) = 'text' "
+                "AND typeof(amount) IN ('real', 'integer') AND abs(amount) < 1e999 "
+                "ORDER BY rowid"
+            ).fetchall()
+            total = con.execute("SELECT COUNT(*) FROM expenses").fetchone()[0]
+        finally:
+            con.close()
+    except Exception as e:
+        print(f"Error while loading expenses: {e}")
+        return
+    if rows:
+        dates, descs, amounts, categories, months = zip(*rows)
+        extend_expenses(dates, descs, amounts, categories, months)
+    print(f"Loaded {len(rows)} expense(s). Skipped {total - len(rows)} invalid row(s).")
+
+"""
+-Checks the file exists first (sqlite3.connect would silently create an empty database).
+-Reads the whole table in one query, in the order it was saved.
+-The query only returns rows with text fields and a finite number as amount
+ (1e999 is infinity in SQLite); NULLs or wrong types in a hand-edited database
+ are counted as skipped instead of crashing the store.
+-Adds the columns to the expense store in one extend_expenses() call.
+"""
+
+def is_parquet_file(filename: str):
+    return filename.lower().endswith(PARQUET_EXTENSIONS)
+
+
+def save_expenses_parquet(filename: str):
+    if not HAS_PYARROW:
+        print("pyarrow not available. Save expenses as CSV or .db instead.")
+        return
+    if not expense_count():
+        print("No expenses to save.")
+        return
+    try:
+        table = pa.table({
+            "date": pa.array(_dates, type=pa.string()),
+            "description": pa.array(_descs, type=pa.string()),
+            "amount": pa.array(_amounts, type=pa.float64()),
+            "category": pa.DictionaryArray.from_arrays(
+                pa.array(_cat_ids, type=pa.int32()), pa.array(_cat_names, type=pa.string())
+            ),
+            "month": pa.DictionaryArray.from_arrays(
+                pa.array(_month_ids, type=pa.int32()), pa.array(_month_names, type=pa.string())
+            ),
+        })
+        pq.write_table(table, filename, compression="zstd")
+        print(f"Saved {expense_count()} expense(s) to '{filename}'.")
+    except Exception as e:
+        print(f"Error while saving expenses: {e}")
+
+"""
+-Writes the expense store columns straight into a Parquet file (zstd-compressed).
+-Category and month are written as Arrow dictionary columns: the store already
+ keeps them as ids + a name table, so the ids become the dictionary indices as-is.
+-Much smaller than CSV, and reloading needs no text parsing.
+"""
+
+def load_expenses_parquet(filename: str):
+    if not HAS_PYARROW:
+        print("pyarrow not available. Load expenses from CSV or .db instead.")
+        return
+    if not os.path.exists(filename):
+        print(f"File not found: {filename}")
+        return
+    try:
+        table = pq.read_table(
+            filename, columns=["date", "description", "amount", "category", "month"], memory_map=True
+        ).unify_dictionaries()
+        amount = table.column("amount").cast(pa.float64())
+        valid = pc.is_finite(amount)
+        for name in ("date", "description", "category", "month"):
+            valid = pc.and_(valid, pc.is_valid(table.column(name)))
+        kept = table.filter(valid)
+        categories = _decode_dictionary(kept.column("category"))
+        months = _decode_dictionary(kept.column("month"))
+        dates = kept.column("date").cast(pa.string()).to_pylist()
+        descs = kept.column("description").cast(pa.string()).to_pylist()
+        amounts = amount.filter(valid).to_pylist()
+    except Exception as e:
+        print(f"Error while loading expenses: {e}")
+        return
+    extend_expenses(dates, descs, amounts, categories, months)
+    print(f"Loaded {len(amounts)} expense(s). Skipped {table.num_rows - len(amounts)} invalid row(s).")
+
+
+def _decode_dictionary(column):
+    column = column.combine_chunks()
+    if not pa.types.is_dictionary(column.type):
+        return column.cast(pa.string()).to_pylist()
+    names = column.dictionary.cast(pa.string()).to_pylist()
+    return list(map(names.__getitem__, column.indices.to_pylist()))
+
+"""
+-Reads only the five expense columns (memory-mapped) in one call.
+-Rows with a missing (null) field or a non-finite amount are dropped before anything
+ is added and counted as skipped, like in the CSV loaders. Columns are converted to
+ text / float first, so a file written by another tool cannot break the store.
+-Category and month are decoded through their (small) dictionary: the ids are turned into
+ Python ints once and each name string is created once, instead of one string per row.
+-Rows come back in saved order and are added with one extend_expenses() call.
+"""
+
+def save_budgets_sqlite(filename: str):
+    if not budgets_by_month:
+        print("No budgets to save.")
+        return
+    try:
+        con = sqlite3.connect(filename)
+        try:
+            with con:
+                con.execute("DROP TABLE IF EXISTS budgets")
+                con.execute(
+                    "CREATE TABLE budgets "
+                    "(month TEXT, category TEXT, budget REAL, PRIMARY KEY (month, category))"
+                )
+                con.executemany(
+                    "INSERT INTO budgets VALUES (?, ?, ?)",
+                    (
+                        (month, cat, value)
+                        for month in budget_months()
+                        for cat, value in budgets_by_month[month].items()
+                    ),
+                )
+        finally:
+            con.close()
+        print(f"Saved budgets to '{filename}'.")
+    except Exception as e:
+        print(f"Error while saving budgets: {e}")
+
+
+def load_budgets_sqlite(filename: str):
+    if not os.path.exists(filename):
+        print(f"File not found: {filename}")
+        return
+    try:
+        con = sqlite3.connect(filename)
+        try:
+            rows = con.execute(
+                "SELECT month, category, budget FROM budgets "
+                "WHERE typeof(month) = 'text' AND typeof(category) = 'text' "
+                "AND typeof(budget) IN ('real', 'integer') AND abs(budget) < 1e999"
+            ).fetchall()
+            total = con.execute("SELECT COUNT(*) FROM budgets").fetchone()[0]
+        finally:
+            con.close()
+    except Exception as e:
+        print(f"Error while loading budgets: {e}")
+        return
+    for month, cat, value in rows:
+        budgets_by_month[sys.intern(month)][sys.intern(cat)] = round(value, 2)
+    _budgets_changed()
+    print(f"Loaded {len(rows)} budget row(s). Skipped {total - len(rows)} invalid row(s).")
+
+"""
+Same as the expense functions, for the "budgets" table.
+(month, category) is the primary key, so each budget is stored once and indexed by month.
+Rows with a NULL / non-text month or category, or a missing or non-finite budget, are skipped.
+"""
+
 def list_budgets_for_month(month_input: str):
     items = get_budget_items_for_month(month_input)
     if not items:
         print(f"No budgets found for month '{month_input}'.")
         return
-    print("-" * 50)
-    print(f"Budgets for {month_input}")
-    print("-" * 50)
-    print(f"{'Category':20s} {'Budget':>10s}")
-    print("-" * 50)
-    for cat, value in items:
-        print(f"{cat:20s} {value:10.2f}")
-    print("-" * 50)
+    sys.stdout.write("\n".join(_budget_table_lines(month_input, items)) + "\n")
+
+
+def _budget_table_lines(month_input: str, items):
+    rule = "-" * 50
+    out = [rule, f"Budgets for {month_input}", rule, f"{'Category':20s} {'Budget':>10s}", rule]
+    out.extend(f"{cat:20s} {value:10.2f}" for cat, value in items)
+    out.append(rule)
+    return out
 
 
 def get_budget_items_for_month(month_input: str):
     month_budgets = budgets_by_month.get(month_input, {})
-    return sorted(month_budgets.items(), key=lambda item: item[0].lower())
+    return sorted(month_budgets.items(), key=lambda item: category_sort_key(item[0]))
 # Retrieves budget for a month and returns a sorted list of (category, budget) pairs.
 
 def list_budgets_for_month_with_numbers(month_input: str):
@@ -560,14 +1422,11 @@ def list_budgets_for_month_with_numbers(month_input: str):
     if not items:
         print(f"No budgets found for month '{month_input}'.")
         return []
-    print("-" * 60)
-    print(f"Budgets for {month_input}")
-    print("-" * 60)
-    print(f"{'No.':>3s}  {'Category':20s} {'Budget':>10s}")
-    print("-" * 60)
-    for i, (cat, value) in enumerate(items, start=1):
-        print(f"{i:3d}  {cat:20s} {value:10.2f}")
-    print("-" * 60)
+    rule = "-" * 60
+    out = [rule, f"Budgets for {month_input}", rule, f"{'No.':>3s}  {'Category':20s} {'Budget':>10s}", rule]
+    out.extend(f"{i:3d}  {cat:20s} {value:10.2f}" for i, (cat, value) in enumerate(items, start=1))
+    out.append(rule)
+    sys.stdout.write("\n".join(out) + "\n")
     return items
 
 
@@ -575,9 +1434,15 @@ def list_all_budgets():
     if not budgets_by_month:
         print("No budgets to display.")
         return
-    for month in sorted(budgets_by_month.keys()):
-        list_budgets_for_month(month)
-# Prints each month in sorted order.
+    out = []
+    for month in budget_months():
+        items = get_budget_items_for_month(month)
+        if items:
+            out.extend(_budget_table_lines(month, items))
+        else:
+            out.append(f"No budgets found for month '{month}'.")
+    sys.stdout.write("\n".join(out) + "\n")
+# Prints each month in sorted order, all months in one write.
 
 def add_budget_interactive():
     while True:
@@ -602,9 +1467,8 @@ def add_budget_interactive():
         if amount_val is None:
             print("Invalid amount.")
             continue
-        if month_input not in budgets_by_month:
-            budgets_by_month[month_input] = {}
         budgets_by_month[month_input][cat] = round(amount_val, 2)
+        _budgets_changed()
         print(f"Budget saved for {month_input} / {cat}.")
 
 
@@ -645,6 +1509,7 @@ def edit_budget_interactive():
     if new_cat != old_cat:
         del budgets_by_month[month_input][old_cat]
     budgets_by_month[month_input][new_cat] = new_value
+    _budgets_changed()
     print("Budget updated.")
 
 
@@ -657,23 +1522,29 @@ def delete_all_budgets():
         print("Delete cancelled.")
         return
     budgets_by_month.clear()
+    _budgets_changed()
     print("All budgets deleted.")
 
 
-def list_expenses(records):
-    if not records:
+def list_expenses(rows=None):
+    if rows is None:
+        rows = range(expense_count())
+    if len(rows) == 0:
         print("No expenses to display.")
         return
-    print("-" * 80)
-    print(f"{'No.':>3s}  {'Date':10s}  {'Category':14s}  {'Amount':>10s}  Description")
-    print("-" * 80)
-    for i, rec in enumerate(records, start=1):
-        date_str = rec[IDX_DATE]
-        cat = rec[IDX_CATEGORY]
-        amt = rec[IDX_AMOUNT]
-        desc = rec[IDX_DESC]
-        print(f"{i:3d}  {date_str:10s}  {cat:14s}  {amt:10.2f}  {desc}")
-    print("-" * 80)
+    rule = "-" * 80
+    out = [rule, f"{'No.':>3s}  {'Date':10s}  {'Category':14s}  {'Amount':>10s}  Description", rule]
+    out.extend(
+        f"{n:3d}  {_dates[i]:10s}  {_cat_names[_cat_ids[i]]:14s}  {_amounts[i]:10.2f}  {_descs[i]}"
+        for n, i in enumerate(rows, start=1)
+    )
+    out.append(rule)
+    sys.stdout.write("\n".join(out) + "\n")
+"""
+- rows are row numbers in the expense store (e.g. from rows_for_month()); None means all expenses.
+- Each line is formatted straight from the store columns, no per-row records are built.
+- The table is built as a list of lines and written once, instead of one print() per row.
+"""
 
 
 def add_expense_interactive():
@@ -691,7 +1562,7 @@ def add_expense_interactive():
         return
 
     cat = categorize_expense(desc)
-    expenses.append([date_str, desc, amount_val, cat, month_val])
+    append_expense(date_str, desc, amount_val, cat, month_val)
     print(f"Added expense in category '{cat}' (month {month_val}).")
 
 
@@ -701,60 +1572,138 @@ def edit_expense_interactive():
     if month_input is None:
         print("Invalid month format.")
         return
-    records = [rec for rec in expenses if rec[IDX_MONTH] == month_input]
-    if not records:
+    rows = rows_for_month(month_input)
+    if len(rows) == 0:
         print(f"No expenses found for month '{month_input}'.")
         return
 
-    list_expenses(records)
+    list_expenses(rows)
     choice = input("Select expense number to edit: ").strip()
     if not choice.isdigit():
         print("Invalid selection.")
         return
     idx = int(choice) - 1
-    if idx < 0 or idx >= len(records):
+    if idx < 0 or idx >= len(rows):
         print("Selection out of range.")
         return
 
-    rec = records[idx]
+    i = int(rows[idx])
 
-    new_date = input(f"New date (enter to keep '{rec[IDX_DATE]}'): ").strip()
+    new_date = input(f"New date (enter to keep '{_dates[i]}'): ").strip()
     if new_date:
         month_val = extract_month(new_date)
         if month_val is None:
             print("Invalid date. Edit cancelled.")
             return
-        rec[IDX_DATE] = new_date
-        rec[IDX_MONTH] = month_val
+        old_month = _month_names[_month_ids[i]]
+        _dates[i] = sys.intern(new_date)
+        _month_ids[i] = _month_id(month_val)
+        if month_val != old_month:
+            _index_remove(i, old_month)
+            _index_add(i, month_val)
+        _expenses_changed()
 
     new_desc = input(f"New description (enter to keep current): ").strip()
     if new_desc:
-        rec[IDX_DESC] = new_desc
-        rec[IDX_CATEGORY] = categorize_expense(new_desc)
+        _descs[i] = _intern_desc(new_desc)
+        _cat_ids[i] = _category_id(categorize_expense(new_desc))
+        _expenses_changed()
 
-    new_amount = input(f"New amount (enter to keep '{rec[IDX_AMOUNT]:.2f}'): ").strip()
+    new_amount = input(f"New amount (enter to keep '{_amounts[i]:.2f}'): ").strip()
     if new_amount:
         amount_val = safe_float(new_amount)
         if amount_val is None:
             print("Invalid amount. Edit cancelled.")
             return
-        rec[IDX_AMOUNT] = amount_val
+        _amounts[i] = amount_val
+        _expenses_changed()
 
     print("Expense updated.")
 
 
-def calculate_totals(records):
-    totals = {}
-    for rec in records:
-        cat = rec[IDX_CATEGORY]
-        amt = rec[IDX_AMOUNT]
-        totals[cat] = totals.get(cat, 0.0) + amt
-    return totals
+def calculate_totals(rows):
+    if HAS_NUMPY:
+        rows = np.asarray(rows, dtype=np.intp)
+        cat_ids = np.frombuffer(_cat_ids, dtype=np.intc)[rows]
+        amounts = np.frombuffer(_amounts, dtype=np.float64)[rows]
+        sums = np.bincount(cat_ids, weights=amounts, minlength=len(_cat_names))
+        counts = np.bincount(cat_ids, minlength=len(_cat_names))
+        return {_cat_names[c]: float(sums[c]) for c in np.flatnonzero(counts)}
+    sums = defaultdict(float)
+    cat_ids = _cat_ids
+    amounts = _amounts
+    for i in rows:
+        sums[cat_ids[i]] += amounts[i]
+    return {_cat_names[c]: total for c, total in sums.items()}
+
+"""
+Sums the amounts per category for the given row numbers (e.g. from rows_for_month()).
+-With numpy: np.bincount over the category id column, weighted by amount.
+ One O(n) pass, no argsort/reduceat needed because category ids are small integers.
+-counts is used so only categories that actually have expenses are returned.
+-Without numpy: sums by category id and turns ids into names once at the end.
+"""
 
 
 def all_categories_from_data_and_budgets(totals, month_budgets):
     cats = set(totals.keys()) | set(month_budgets.keys())
-    return sorted(cats, key=str.lower)
+    return sorted(cats, key=category_sort_key)
+
+
+def summarize_month(categories, totals, month_budgets):
+    if HAS_NUMPY:
+        spent_arr = np.array([totals.get(cat, 0.0) for cat in categories], dtype=np.float64)
+        budget_arr = np.array([month_budgets.get(cat, np.nan) for cat in categories], dtype=np.float64)
+        has_budget = ~np.isnan(budget_arr)
+        remain_arr = budget_arr - spent_arr
+        exceeded = [categories[i] for i in np.flatnonzero(remain_arr < 0)]
+        total_spent_all = float(spent_arr.sum())
+        total_budget_all = float(budget_arr[has_budget].sum())
+        budgets = [b if ok else None for b, ok in zip(budget_arr.tolist(), has_budget.tolist())]
+        return spent_arr.tolist(), budgets, remain_arr.tolist(), exceeded, total_spent_all, total_budget_all
+
+    spent = [totals.get(cat, 0.0) for cat in categories]
+    budgets = [month_budgets.get(cat) for cat in categories]
+    remain = [None if b is None else b - s for s, b in zip(spent, budgets)]
+    exceeded = [cat for cat, r in zip(categories, remain) if r is not None and r < 0]
+    total_spent_all = sum(spent)
+    total_budget_all = sum(b for b in budgets if b is not None)
+    return spent, budgets, remain, exceeded, total_spent_all, total_budget_all
+
+"""
+Computes everything the monthly summary needs, aligned with categories:
+-spent, budgets (None = no budget) and remain per category
+-exceeded: categories where remain < 0
+-total_spent_all / total_budget_all
+With numpy, spent and budget are two aligned arrays (missing budget = NaN) and
+remain, the exceeded mask and both totals come from whole-array operations.
+"""
+
+
+def month_summary(month_str: str):
+    version = (_expenses_version, _budgets_version)
+    cached = _summary_cache.get(month_str)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    rows = rows_for_month(month_str)
+    if len(rows) == 0:
+        summary = None
+    else:
+        totals = calculate_totals(rows)
+        month_budgets = budgets_by_month.get(month_str, {})
+        categories = all_categories_from_data_and_budgets(totals, month_budgets)
+        summary = (totals, categories) + summarize_month(categories, totals, month_budgets)
+    _summary_cache[month_str] = (version, summary)
+    return summary
+
+"""
+Returns (totals, categories, spent, budgets, remain, exceeded, total_spent_all, total_budget_all)
+for a month, or None if the month has no expenses.
+The result is cached per month together with the expense/budget version numbers,
+so opening the summary (or plot) again without changing anything reuses it.
+Any change bumps a version, and the next call recomputes. Results are shared, so callers must not modify them.
+"""
 
 
 def show_monthly_summary():
@@ -775,55 +1724,47 @@ def show_monthly_summary():
         print("Invalid year or month format.")
         return
 
-    records = [rec for rec in expenses if rec[IDX_MONTH] == month_str]
-    if not records:
+    summary = month_summary(month_str)
+    if summary is None:
         print(f"No expenses found for month '{month_str}'.")
         return
 
-    totals = calculate_totals(records)
-    month_budgets = budgets_by_month.get(month_str, {})
-    categories = all_categories_from_data_and_budgets(totals, month_budgets)
-
-    print("\n=== Monthly Summary ===")
-    print(f"Month: {month_str}")
-    print("-" * 72)
-    print(f"{'Category':18s} {'Budget':>10s} {'Spent':>10s} {'Remain':>10s}  Status")
-    print("-" * 72)
-
-    exceeded = []
-    total_spent_all = 0.0
-    total_budget_all = 0.0
-
-    for cat in categories:
-        spent = totals.get(cat, 0.0)
-        budget = month_budgets.get(cat)
-        total_spent_all += spent
-
+    (categories, spent_list, budget_list, remain_list,
+     exceeded, total_spent_all, total_budget_all) = summary[1:]
+
+    out = [
+        "\n=== Monthly Summary ===",
+        f"Month: {month_str}",
+        "-" * 72,
+        f"{'Category':18s} {'Budget':>10s} {'Spent':>10s} {'Remain':>10s}  Status",
+        "-" * 72,
+    ]
+    for cat, spent, budget, remain in zip(categories, spent_list, budget_list, remain_list):
         if budget is None:
             status = "NO BUDGET"
             remain_str = ""
             budget_str = ""
         else:
-            total_budget_all += budget
-            remain = budget - spent
             status = "OK" if remain >= 0 else "BUDGET EXCEEDED"
-            if remain < 0:
-                exceeded.append(cat)
             remain_str = f"{remain:10.2f}"
             budget_str = f"{budget:10.2f}"
 
         spent_str = f"{spent:10.2f}"
-        print(f"{cat:18s} {budget_str:>10s} {spent_str:>10s} {remain_str:>10s}  {status}")
-
-    print("-" * 72)
+        out.append(f"{cat:18s} {budget_str:>10s} {spent_str:>10s} {remain_str:>10s}  {status}")
+    out.append("-" * 72)
     if total_budget_all > 0:
-        print(f"{'TOTAL':18s} {total_budget_all:10.2f} {total_spent_all:10.2f}")
+        out.append(f"{'TOTAL':18s} {total_budget_all:10.2f} {total_spent_all:10.2f}")
     else:
-        print(f"{'TOTAL':18s} {'':>10s} {total_spent_all:10.2f}")
+        out.append(f"{'TOTAL':18s} {'':>10s} {total_spent_all:10.2f}")
 
     if exceeded:
-        print("WARNING: Budget exceeded in:", ", ".join(exceeded))
+        out.append("WARNING: Budget exceeded in: " + ", ".join(exceeded))
+    sys.stdout.write("\n".join(out) + "\n")
 
+"""
+-The title, table header, one line per category, TOTAL and the optional WARNING
+ are collected in out and written with a single sys.stdout.write(), like list_expenses().
+"""
 
 def plot_spending_by_category():
     if not HAS_MPL:
@@ -846,39 +1787,62 @@ def plot_spending_by_category():
         print("Invalid year or month format.")
         return
 
-    records = [rec for rec in expenses if rec[IDX_MONTH] == month_str]
-    if not records:
+    summary = month_summary(month_str)
+    if summary is None:
         print(f"No expenses found for month '{month_str}'.")
         return
 
-    totals = calculate_totals(records)
-    cats = sorted(totals.keys(), key=str.lower)
+    totals, categories = summary[0], summary[1]
+    cats = [c for c in categories if c in totals]
     if not cats:
         print("No categories found for the selected month.")
         return
-    values = [totals[c] for c in cats]
+    if HAS_NUMPY:
+        values = np.fromiter((totals[c] for c in cats), dtype=np.float64, count=len(cats))
+    else:
+        values = [totals[c] for c in cats]
     print(f"Plotting {len(cats)} category(ies) for {month_str}.")
 
     month_budgets = budgets_by_month.get(month_str, {})
 
-    plt.figure(figsize=(8, 4))
-    bars = plt.bar(cats, values)
-    for i, cat in enumerate(cats):
-        budget = month_budgets.get(cat)
-        if budget is not None:
-            plt.hlines(
-                y=budget,
-                xmin=i - 0.4,
-                xmax=i + 0.4,
-                colors="red",
-                linewidth=2,
-            )
-    plt.xlabel("Category")
-    plt.ylabel("Total Spent")
-    plt.title(f"Spending by Category ({month_str})")
-    plt.xticks(rotation=30, ha="right")
-    plt.tight_layout()
-    plt.show()
+    global _fig, _ax
+    if _fig is None or not plt.fignum_exists(_fig.number):
+        _fig, _ax = plt.subplots(figsize=(8, 4))
+    else:
+        _ax.cla()
+    _ax.bar(cats, values)
+    budget_pos = [i for i, cat in enumerate(cats) if cat in month_budgets]
+    if budget_pos:
+        _ax.hlines(
+            y=[month_budgets[cats[i]] for i in budget_pos],
+            xmin=[i - 0.4 for i in budget_pos],
+            xmax=[i + 0.4 for i in budget_pos],
+            colors="red",
+            linewidth=2,
+        )
+    _ax.set_xlabel("Category")
+    _ax.set_ylabel("Total Spent")
+    _ax.set_title(f"Spending by Category ({month_str})")
+    plt.setp(_ax.get_xticklabels(), rotation=30, ha="right")
+    _fig.tight_layout()
+
+    if PLOT_SAVE_ONLY or plt.get_backend().lower() == "agg":
+        filename = f"spending_{month_str}.png"
+        _fig.savefig(filename)
+        print(f"Plot saved to '{filename}'.")
+    else:
+        plt.show()
+
+"""
+-Totals and the sorted category list come from month_summary(), so plotting
+ a month that was just summarized does no aggregation or sorting again.
+-Bar heights are passed as a float64 array (np.fromiter) when numpy is installed.
+-One figure is created on first use and cleared with cla() for later plots.
+ If the user closed its window, a new figure is created.
+-All budget lines are drawn with a single hlines() call.
+-With a non-GUI backend (PLOT_SAVE_ONLY=1 or no display), the plot is saved
+ as spending_YYYY-MM.png instead of calling plt.show().
+"""
 
 
 def show_main_menu():
@@ -902,8 +1866,8 @@ def show_expenses_menu():
         "=================\n"
         "Expenses (Menu)\n"
         "=================\n"
-        "1  - Load expenses from CSV\n"
-        "2  - Save expenses to CSV\n"
+        "1  - Load expenses from CSV / .db / .parquet\n"
+        "2  - Save expenses to CSV / .db / .parquet\n"
         "3  - Delete all expenses\n"
         "4  - List expenses (selected month)\n"
         "5  - List expenses (all)\n"
@@ -919,8 +1883,8 @@ def show_budgets_menu():
         "================\n"
         "Budgets (Menu)\n"
         "================\n"
-        "1  - Load budgets from CSV\n"
-        "2  - Save budgets to CSV\n"
+        "1  - Load budgets from CSV / .db\n"
+        "2  - Save budgets to CSV / .db\n"
         "3  - Delete all budgets\n"
         "4  - List budgets (selected month)\n"
         "5  - List budgets (all)\n"
@@ -944,6 +1908,16 @@ def show_categories_menu():
     )
 
 
+def _pause():
+    if sys.stdin.isatty():
+        input("\nPress Enter to continue...")
+
+"""
+Waits for Enter after each menu action, but only when a person is typing.
+If input is piped in (scripted runs, imports from a batch file), there is
+nobody to press Enter, so the pause is skipped.
+"""
+
 def handle_expenses_menu():
     while True:
         show_expenses_menu()
@@ -951,10 +1925,20 @@ def handle_expenses_menu():
 
         if choice == "1":
             fn = input("Expense CSV filename: ").strip()
-            load_expenses_csv(fn)
+            if is_sqlite_file(fn):
+                load_expenses_sqlite(fn)
+            elif is_parquet_file(fn):
+                load_expenses_parquet(fn)
+            else:
+                load_expenses_csv(fn)
         elif choice == "2":
             fn = input("Save expenses to filename: ").strip()
-            save_expenses_csv(fn)
+            if is_sqlite_file(fn):
+                save_expenses_sqlite(fn)
+            elif is_parquet_file(fn):
+                save_expenses_parquet(fn)
+            else:
+                save_expenses_csv(fn)
         elif choice == "3":
             delete_all_expenses()
         elif choice == "4":
@@ -963,10 +1947,9 @@ def handle_expenses_menu():
             if month_input is None:
                 print("Invalid month format.")
             else:
-                records = [rec for rec in expenses if rec[IDX_MONTH] == month_input]
-                list_expenses(records)
+                list_expenses(rows_for_month(month_input))
         elif choice == "5":
-            list_expenses(expenses)
+            list_expenses()
         elif choice == "6":
             add_expense_interactive()
         elif choice == "7":
@@ -976,7 +1959,7 @@ def handle_expenses_menu():
         else:
             print("Invalid selection. Please choose a valid menu number.")
 
-        input("\nPress Enter to continue...")
+        _pause()
 
 
 def handle_categories_menu():
@@ -997,7 +1980,7 @@ def handle_categories_menu():
         else:
             print("Invalid selection. Please choose a valid menu number.")
 
-        input("\nPress Enter to continue...")
+        _pause()
 
 
 def handle_budgets_menu():
@@ -1007,10 +1990,16 @@ def handle_budgets_menu():
 
         if choice == "1":
             fn = input("Budget CSV filename: ").strip()
-            load_budgets_csv(fn)
+            if is_sqlite_file(fn):
+                load_budgets_sqlite(fn)
+            else:
+                load_budgets_csv(fn)
         elif choice == "2":
             fn = input("Save budgets to filename: ").strip()
-            save_budgets_csv(fn)
+            if is_sqlite_file(fn):
+                save_budgets_sqlite(fn)
+            else:
+                save_budgets_csv(fn)
         elif choice == "3":
             delete_all_budgets()
         elif choice == "4":
@@ -1031,7 +2020,7 @@ def handle_budgets_menu():
         else:
             print("Invalid selection. Please choose a valid menu number.")
 
-        input("\nPress Enter to continue...")
+        _pause()
 
 
 def main():
@@ -1055,7 +2044,7 @@ def main():
         else:
             print("Invalid selection. Please choose a valid menu number.")
 
-        input("\nPress Enter to continue...")
+        _pause()
 
 
 if __name__ == "__main__":